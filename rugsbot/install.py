@@ -9,22 +9,24 @@ import os
 from pathlib import Path
 
 def run_command(command, description):
-    """Run a command and handle errors."""
+    """Run a command (an argument list, executed without a shell) and handle errors.
+
+    Output streams straight to the terminal, so any error is already visible there.
+    """
     print(f"📦 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        subprocess.run(command, check=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed:")
-        print(f"Error: {e.stderr}")
+        print(f"❌ {description} failed (exit code {e.returncode})")
         return False
 
 def check_python_version():
     """Check if Python version is compatible."""
     print("🔍 Checking Python version...")
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8 or higher is required")
+    if sys.version_info < (3, 11):
+        print("❌ Python 3.11 or higher is required")
         print(f"Current version: {sys.version}")
         return False
     print(f"✅ Python {sys.version.split()[0]} is compatible")
@@ -48,10 +50,10 @@ def install_dependencies():
             return False
     
     # Install dependencies
-    if not run_command(f"{sys.executable} -m pip install --upgrade pip", "Upgrading pip"):
+    if not run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], "Upgrading pip"):
         return False
     
-    if not run_command(f"{sys.executable} -m pip install -r requirements.txt", "Installing requirements"):
+    if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], "Installing requirements"):
         return False
     
     return True
@@ -75,7 +77,7 @@ def run_tests():
     """Run the test suite to verify installation."""
     print("\n🧪 Running tests to verify installation...")
     
-    if not run_command(f"{sys.executable} -m pytest tests/ -v", "Running test suite"):
+    if not run_command([sys.executable, "-m", "pytest", "tests/", "-v"], "Running test suite"):
         print("⚠️  Some tests failed, but the bot might still work")
         return True  # Don't fail installation for test failures
     
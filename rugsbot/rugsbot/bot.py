@@ -4,11 +4,17 @@ Core logic for the RUGS.FUN Trading Bot.
 import websockets
 import asyncio
 import json
+import sys
 import time
 import logging
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+import msgspec
 
 from . import config
 from . import utils
+from .utils import ENGINE_PING, ENGINE_PONG
 
 # --- Initialize Logger ---
 logging.basicConfig(
@@ -18,72 +24,293 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Round and heartbeat timing only measures intervals, so use a clock that
+# cannot jump when the system time is adjusted.
+_now = time.monotonic
+
+# Ticks arrive many times per second; the INFO "Game Update" line is emitted at
+# most once per interval (or whenever the round's active flag flips).
+_GAME_UPDATE_LOG_INTERVAL_SECONDS = 1.0
+
+
+# --- Typed Event Payloads ---
+# IMPORTANT: Confirm these fields against real RUGS.FUN payloads. Unknown fields
+# are ignored, so only what the bot reads needs to be declared here.
+class GameStateUpdate(msgspec.Struct):
+    price: float = 0.0
+    tick: int = 0
+    active: bool = False
+    # rugged: bool = False # Assuming a 'rugged' field might appear
+
+
+class BetPlaced(msgspec.Struct, rename="camel"):
+    entry_price: Optional[float] = None
+    price: Optional[float] = None
+    amount: Optional[float] = None
+    id: Union[str, int, None] = None
+
+
+class BetSold(msgspec.Struct):
+    payout: float = 0.0
+    # profit: Optional[float] = None # Alternative, if server sends profit directly
+
+
+class BetLost(msgspec.Struct):
+    amount: Optional[float] = None
+
+
+# A '42' frame body is a two-element JSON array. Decoding the payload as Raw
+# defers it to the event's own typed decoder once the event name is known.
+_FRAME_DECODER = msgspec.json.Decoder(tuple[str, msgspec.Raw])
+
+
+@dataclass(frozen=True, slots=True)
+class StrategySettings:
+    """Strategy settings read on every tick, snapshotted once from :mod:`config`."""
+    stake_amount: float
+    profit_target: float
+    session_profit_target: float
+    buy_window_seconds: float
+    buy_price_ceiling: float
+    # The place/sell frames never change within a session, so encode them once.
+    buy_frame: str = field(init=False, repr=False)
+    sell_frame: str = field(init=False, repr=False)
 
-# --- Bot State Variables ---
-# These are global for simplicity in this single-file structure example.
-# For more complex bots, consider encapsulating state within a class.
-session_profit_accumulator = 0.0
-is_bet_active = False
-current_bet_entry_price = 0.0
-current_bet_id = None # Optional: if the game assigns IDs to bets
-game_start_time = 0 # Timestamp of when the current active round started
-last_ping_time = 0 # To manage client-side PING if necessary
+    def __post_init__(self):
+        bet_payload = {
+            "amount": self.stake_amount,
+            "autoSellMultiplier": None, # We handle sell logic manually
+            "stopLossMultiplier": None  # We handle sell logic manually
+        }
+        object.__setattr__(self, "buy_frame", utils.build_socketio_frame(config.SOCKETIO_EVENT_PLACE_BET, bet_payload))
+        object.__setattr__(self, "sell_frame", utils.build_socketio_frame(config.SOCKETIO_EVENT_SELL_BET, {"percentage": 100}))
 
-async def handle_game_state_update(websocket, payload):
-    """Handles logic for 'gameStateUpdate' events."""
-    global is_bet_active, game_start_time, current_bet_entry_price
+    @classmethod
+    def from_config(cls) -> "StrategySettings":
+        return cls(
+            stake_amount=config.STAKE_AMOUNT,
+            profit_target=config.PER_TRADE_PROFIT_MULTIPLIER_TARGET,
+            session_profit_target=config.SESSION_PROFIT_TARGET_SOL,
+            buy_window_seconds=config.MAX_BUY_WINDOW_SECONDS,
+            buy_price_ceiling=config.DYNAMIC_BUY_PRICE_CEILING,
+        )
 
-    price = payload.get("price", 0.0)
-    tick = payload.get("tick", 0)
-    game_is_active_round = payload.get("active", False)
-    # rugged = payload.get("rugged", False) # Assuming a 'rugged' field might appear
 
-    logger.info(f"Game Update: Price={price:.8f}, Tick={tick}, Active={game_is_active_round}")
+@dataclass(slots=True)
+class BotState:
+    """Mutable state for one bot session."""
+    settings: StrategySettings = field(default_factory=StrategySettings.from_config)
+    session_profit_accumulator: float = 0.0
+    is_bet_active: bool = False
+    current_bet_entry_price: float = 0.0
+    sell_trigger_price: float = 0.0 # Entry price times profit target, set when a bet is confirmed
+    current_bet_id: Optional[str] = None # Optional: if the game assigns IDs to bets
+    game_start_time: float = 0.0 # Monotonic timestamp of when the current active round started
+    buy_deadline: float = 0.0 # game_start_time + buy window; buys are allowed until then
+    last_ping_time: float = 0.0 # To manage client-side PING if necessary
+    round_started_logged: bool = False # True once the start of the current round has been recorded
+    stop_requested: bool = False # Set by a handler to end the listening loop
+    last_info_log_time: float = 0.0 # When the last INFO "Game Update" line was emitted
+    prev_active: bool = False # Round active flag from the previous tick
+    out_queue: asyncio.Queue = field(default_factory=asyncio.Queue) # Outbound frames drained by _sender
+    handlers: dict = field(default_factory=lambda: dict(_EVENT_HANDLERS)) # Per-session copy of _EVENT_HANDLERS
 
-    current_time = time.time()
+    def __post_init__(self):
+        # The tick handler mirrors is_bet_active; install the one matching the initial flag.
+        _set_bet_active(self, self.is_bet_active)
 
-    if game_is_active_round and not getattr(handle_game_state_update, "round_started_logged", False):
-        game_start_time = current_time
-        logger.info(f"New round started at {game_start_time}")
-        handle_game_state_update.round_started_logged = True
+
+def _queue_frame(state: BotState, frame: str):
+    """Queues an already-encoded frame for the sender task."""
+    state.out_queue.put_nowait(frame)
+    logger.info("Queued: %s", frame)
+
+
+async def _sender(websocket, queue: asyncio.Queue):
+    """Writes queued frames to the socket so sends never stall the receive loop."""
+    while True:
+        message = await queue.get()
+        try:
+            await websocket.send(message)
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning("WebSocket closed, dropping outbound frame: %.100s", message)
+            return
+        except Exception as e:
+            logger.error("Error sending frame %.100s: %s", message, e)
+
+
+def _observe_tick(state: BotState, update: GameStateUpdate) -> float:
+    """Bookkeeping shared by both tick handlers; returns the tick's timestamp."""
+    current_time = _now()
+    game_is_active_round = update.active
+
+    if game_is_active_round != state.prev_active or current_time - state.last_info_log_time > _GAME_UPDATE_LOG_INTERVAL_SECONDS:
+        logger.info("Game Update: Price=%.8f, Tick=%s, Active=%s", update.price, update.tick, game_is_active_round)
+        state.last_info_log_time = current_time
+        state.prev_active = game_is_active_round
+
+    if game_is_active_round and not state.round_started_logged:
+        state.game_start_time = current_time
+        state.buy_deadline = current_time + state.settings.buy_window_seconds
+        logger.info("New round started")
+        state.round_started_logged = True
     elif not game_is_active_round:
-        handle_game_state_update.round_started_logged = False # Reset for next round
+        state.round_started_logged = False # Reset for next round
+
+    return current_time
+
+
+async def _handle_game_state_update_idle(state: BotState, update: GameStateUpdate):
+    """'gameStateUpdate' handler installed while no bet is open: buy logic only."""
+    current_time = _observe_tick(state, update)
+    if not update.active:
+        return
 
     # --- Dynamic Buy Logic ---
-    if game_is_active_round and not is_bet_active:
-        elapsed_time_in_round = current_time - game_start_time
-        if elapsed_time_in_round <= config.MAX_BUY_WINDOW_SECONDS:
-            if price <= config.DYNAMIC_BUY_PRICE_CEILING: # Ensure this condition is meaningful for the game
-                logger.info(f"BUY CONDITION MET: Price {price:.8f} <= {config.DYNAMIC_BUY_PRICE_CEILING}, Time {elapsed_time_in_round:.2f}s")
-                bet_payload = {
-                    "amount": config.STAKE_AMOUNT,
-                    "autoSellMultiplier": None, # We handle sell logic manually
-                    "stopLossMultiplier": None  # We handle sell logic manually
-                }
-                await utils.send_socketio_message(websocket, config.SOCKETIO_EVENT_PLACE_BET, bet_payload)
-                # is_bet_active will be set to True upon receiving "betPlaced" confirmation
-            else:
-                logger.debug(f"Buy condition not met: Price {price:.8f} > ceiling {config.DYNAMIC_BUY_PRICE_CEILING}")
+    # Both checks are plain comparisons against values fixed for the round
+    settings = state.settings
+    ceiling = settings.buy_price_ceiling
+    price = update.price
+    if current_time <= state.buy_deadline:
+        if price <= ceiling: # Ensure this condition is meaningful for the game
+            logger.info("BUY CONDITION MET: Price %.8f <= %s, Time %.2fs", price, ceiling, current_time - state.game_start_time)
+            _queue_frame(state, settings.buy_frame)
+            # is_bet_active will be set to True upon receiving "betPlaced" confirmation
         else:
-            logger.debug(f"Buy condition not met: Elapsed time {elapsed_time_in_round:.2f}s > window {config.MAX_BUY_WINDOW_SECONDS}s")
+            logger.debug("Buy condition not met: Price %.8f > ceiling %s", price, ceiling)
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Buy condition not met: Elapsed time %.2fs > window %ss", current_time - state.game_start_time, settings.buy_window_seconds)
+
+
+async def _handle_game_state_update_active(state: BotState, update: GameStateUpdate):
+    """'gameStateUpdate' handler installed while a bet is open: sell logic only."""
+    _observe_tick(state, update)
+    # rugged = update.rugged
+    # if rugged:
+    #     logger.warning(f"RUGGED DETECTED! Attempting to sell immediately.")
+    #     _queue_frame(state, state.settings.sell_frame)
+    #     return # Exit after sell attempt
+    sell_trigger_price = state.sell_trigger_price
+    if not update.active or sell_trigger_price <= 0:
+        return
 
     # --- Sell Logic ---
-    if game_is_active_round and is_bet_active and current_bet_entry_price > 0:
-        # if rugged:
-        #     logger.warning(f"RUGGED DETECTED! Attempting to sell immediately.")
-        #     await utils.send_socketio_message(websocket, config.SOCKETIO_EVENT_SELL_BET, {"percentage": 100})
-        #     return # Exit after sell attempt
-
-        current_profit_multiplier = price / current_bet_entry_price
-        logger.debug(f"Active Bet: Entry={current_bet_entry_price:.8f}, Current Price={price:.8f}, Target Multiplier={config.PER_TRADE_PROFIT_MULTIPLIER_TARGET}, Current Multiplier={current_profit_multiplier:.4f}")
-        if current_profit_multiplier >= config.PER_TRADE_PROFIT_MULTIPLIER_TARGET:
-            logger.info(f"SELL CONDITION MET: Profit Multiplier {current_profit_multiplier:.4f} >= {config.PER_TRADE_PROFIT_MULTIPLIER_TARGET}")
-            await utils.send_socketio_message(websocket, config.SOCKETIO_EVENT_SELL_BET, {"percentage": 100})
-            # is_bet_active will be set to False upon receiving "betSold" or "betLost" confirmation
-
-async def connect_and_listen():
+    price = update.price
+    target = state.settings.profit_target
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Active Bet: Entry=%.8f, Current Price=%.8f, Target Multiplier=%s, Current Multiplier=%.4f", state.current_bet_entry_price, price, target, price / state.current_bet_entry_price)
+    # Compare against the precomputed trigger price instead of dividing by the entry price every tick
+    if price >= sell_trigger_price:
+        logger.info("SELL CONDITION MET: Profit Multiplier %.4f >= %s", price / state.current_bet_entry_price, target)
+        _queue_frame(state, state.settings.sell_frame)
+        # is_bet_active will be set to False upon receiving "betSold" or "betLost" confirmation
+
+
+def _set_bet_active(state: BotState, active: bool):
+    """Flips the bet flag and installs the matching 'gameStateUpdate' handler."""
+    state.is_bet_active = active
+    state.handlers[config.SOCKETIO_EVENT_GAME_STATE_UPDATE] = _ACTIVE_TICK_HANDLER if active else _IDLE_TICK_HANDLER
+
+
+def _on_engine_ping(state: BotState):
+    logger.debug("Received Engine.IO PING, sending PONG.")
+    state.out_queue.put_nowait(ENGINE_PONG)
+    state.last_ping_time = _now()
+
+
+def _on_engine_pong(state: BotState):
+    logger.debug("Received Engine.IO PONG.")
+    state.last_ping_time = _now() # Update time on received PONG too
+
+
+def _on_engine_open(state: BotState, payload: dict):
+    logger.info("Engine.IO connection opened: %s", payload)
+    # sid = payload.get('sid') # Session ID, might be useful
+    # PING_INTERVAL_SECONDS = payload.get('pingInterval', 25000) / 1000 # Server might dictate ping interval
+    # config.PING_TIMEOUT_SECONDS = payload.get('pingTimeout', 20000) / 1000
+
+
+async def _on_bet_placed(state: BotState, event: BetPlaced):
+    settings = state.settings
+    # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
+    # This is a guess based on common patterns.
+    _set_bet_active(state, True)
+    # Assuming the payload directly contains the entry price of our bet.
+    # If not, we might need to use the price from the gameStateUpdate at the time of betting.
+    # Or, the server might send a more detailed bet object.
+    actual_entry_price = event.entry_price if event.entry_price is not None else event.price
+    bet_amount = event.amount if event.amount is not None else settings.stake_amount
+
+    if actual_entry_price: # Ensure we got an entry price
+        state.current_bet_entry_price = actual_entry_price
+    else:
+        logger.warning("'betPlaced' confirmation received, but no entry price found in payload. Using last known price.")
+        # This might be inaccurate; ideally, the server provides the executed price.
+    state.sell_trigger_price = state.current_bet_entry_price * settings.profit_target
+
+    if event.id is not None: # Update bet ID if provided
+        state.current_bet_id = event.id
+    logger.info("BET PLACED: Amount=%s, Entry Price=%.8f, Bet ID=%s", bet_amount, state.current_bet_entry_price, state.current_bet_id)
+
+
+async def _on_bet_sold(state: BotState, event: BetSold):
+    settings = state.settings
+    # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
+    payout = event.payout
+    # If server sends profit directly, use it. Otherwise, calculate from payout and stake.
+    # This assumes payout includes the initial stake.
+    trade_profit = payout - settings.stake_amount
+
+    state.session_profit_accumulator += trade_profit
+    _set_bet_active(state, False)
+    logger.info("BET SOLD: Payout=%.8f, Trade Profit=%.8f, Session Profit=%.8f", payout, trade_profit, state.session_profit_accumulator)
+    state.current_bet_entry_price = 0.0 # Reset for next bet
+    state.sell_trigger_price = 0.0
+    state.current_bet_id = None
+
+    if state.session_profit_accumulator >= settings.session_profit_target:
+        logger.info("SESSION PROFIT TARGET REACHED: %.8f >= %s. Stopping bot.", state.session_profit_accumulator, settings.session_profit_target)
+        state.stop_requested = True # Exit the main listening loop
+
+
+async def _on_bet_lost(state: BotState, event: BetLost):
+    settings = state.settings
+    # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
+    # This event might occur on a rug pull or if a bet is liquidated by the game mechanics
+    lost_amount = event.amount if event.amount is not None else settings.stake_amount # Amount lost, usually the stake
+    state.session_profit_accumulator -= lost_amount # Subtract the stake
+    _set_bet_active(state, False)
+    logger.info("BET LOST: Amount Lost=%.8f, Session Profit=%.8f", lost_amount, state.session_profit_accumulator)
+    state.current_bet_entry_price = 0.0 # Reset for next bet
+    state.sell_trigger_price = 0.0
+    state.current_bet_id = None
+    # Check session target again, in case of losses (though less likely to hit target via loss)
+    if state.session_profit_accumulator >= settings.session_profit_target:
+        logger.info("SESSION PROFIT TARGET REACHED (unexpectedly after loss): %.8f >= %s. Stopping bot.", state.session_profit_accumulator, settings.session_profit_target)
+        state.stop_requested = True
+
+
+# Payload decoders are lax (strict=False) like the old payload.get() reads, so a
+# float tick or a 0/1 active flag is coerced instead of dropping the whole event.
+_GAME_STATE_UPDATE_DECODER = msgspec.json.Decoder(GameStateUpdate, strict=False)
+_IDLE_TICK_HANDLER = (_GAME_STATE_UPDATE_DECODER, _handle_game_state_update_idle)
+_ACTIVE_TICK_HANDLER = (_GAME_STATE_UPDATE_DECODER, _handle_game_state_update_active)
+
+# Event name -> (payload decoder, handler(state, event)). Built once at import so
+# the receive loop does a single dict lookup per frame instead of an if/elif chain.
+# Each BotState works on its own copy so the tick handler can be swapped per session.
+_EVENT_HANDLERS = {
+    config.SOCKETIO_EVENT_GAME_STATE_UPDATE: _IDLE_TICK_HANDLER,
+    config.SOCKETIO_EVENT_BET_PLACED: (msgspec.json.Decoder(BetPlaced, strict=False), _on_bet_placed),
+    config.SOCKETIO_EVENT_BET_SOLD: (msgspec.json.Decoder(BetSold, strict=False), _on_bet_sold),
+    config.SOCKETIO_EVENT_BET_LOST: (msgspec.json.Decoder(BetLost, strict=False), _on_bet_lost),
+}
+
+
+async def connect_and_listen(state: Optional[BotState] = None):
     """Connects to the WebSocket and handles incoming messages and bot logic."""
-    global session_profit_accumulator, is_bet_active, current_bet_entry_price, current_bet_id, last_ping_time
+    if state is None:
+        state = BotState()
 
     custom_headers = {
         "User-Agent": config.DEFAULT_USER_AGENT,
@@ -93,117 +320,78 @@ async def connect_and_listen():
 
     logger.info(f"Attempting to connect to WebSocket: {config.WEBSOCKET_URI}")
     try:
-        async with websockets.connect(config.WEBSOCKET_URI, extra_headers=custom_headers) as websocket:
+        async with websockets.connect(
+            config.WEBSOCKET_URI,
+            extra_headers=custom_headers,
+            compression=None,  # Frames are small JSON; permessage-deflate only costs CPU
+            max_size=2**20,
+            read_limit=2**18,
+            # Let the library detect dead connections with WebSocket-level pings
+            # instead of arming a receive timeout for every frame.
+            ping_interval=config.PING_INTERVAL_SECONDS,
+            ping_timeout=config.PING_TIMEOUT_SECONDS,
+        ) as websocket:
             logger.info("Successfully connected to WebSocket!")
-            last_ping_time = time.time()
-
-            while True:
-                try:
-                    message = await asyncio.wait_for(websocket.recv(), timeout=config.PING_INTERVAL_SECONDS + 5) # Timeout slightly longer than ping interval
-                    event_name, payload = utils.parse_socketio_message(message)
-
-                    if event_name == 'engine_ping':
-                        logger.debug("Received Engine.IO PING, sending PONG.")
-                        await websocket.send('3') # Send Engine.IO PONG
-                        last_ping_time = time.time()
-                        continue
-                    elif event_name == 'engine_pong':
-                        logger.debug("Received Engine.IO PONG.")
-                        last_ping_time = time.time() # Update time on received PONG too
-                        continue
-                    elif event_name == 'engine_open':
-                        logger.info(f"Engine.IO connection opened: {payload}")
-                        # sid = payload.get('sid') # Session ID, might be useful
-                        # PING_INTERVAL_SECONDS = payload.get('pingInterval', 25000) / 1000 # Server might dictate ping interval
-                        # config.PING_TIMEOUT_SECONDS = payload.get('pingTimeout', 20000) / 1000
-                        continue
-
-                    if not event_name:
-                        if message: #If parse_socketio_message returned (None,None) but there was a message string
-                            logger.debug(f"Received unhandled message: {message[:100]}...")
-                        continue # Skip if not a recognized event or type
-
-                    logger.debug(f"Received Event: '{event_name}', Payload: {payload if payload else 'N/A'}")
-
-                    if event_name == config.SOCKETIO_EVENT_GAME_STATE_UPDATE:
-                        await handle_game_state_update(websocket, payload)
-                    
-                    elif event_name == config.SOCKETIO_EVENT_BET_PLACED:
-                        # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
-                        # This is a guess based on common patterns.
-                        is_bet_active = True
-                        # Assuming the payload directly contains the entry price of our bet.
-                        # If not, we might need to use the price from the gameStateUpdate at the time of betting.
-                        # Or, the server might send a more detailed bet object.
-                        actual_entry_price = payload.get("entryPrice", payload.get("price", current_bet_entry_price))
-                        bet_amount = payload.get("amount", config.STAKE_AMOUNT)
-                        
-                        if actual_entry_price: # Ensure we got an entry price
-                            current_bet_entry_price = actual_entry_price
-                        else:
-                            logger.warning("'betPlaced' confirmation received, but no entry price found in payload. Using last known price.")
-                            # This might be inaccurate; ideally, the server provides the executed price.
-
-                        current_bet_id = payload.get("id", current_bet_id) # Update bet ID if provided
-                        logger.info(f"BET PLACED: Amount={bet_amount}, Entry Price={current_bet_entry_price:.8f}, Bet ID={current_bet_id}")
-
-                    elif event_name == config.SOCKETIO_EVENT_BET_SOLD:
-                        # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
-                        payout = payload.get("payout", 0.0)
-                        # profit = payload.get("profit") # Alternative, if server sends profit directly
-                        # If server sends profit directly, use it. Otherwise, calculate from payout and stake.
-                        # This assumes payout includes the initial stake.
-                        trade_profit = payout - config.STAKE_AMOUNT 
-                        
-                        session_profit_accumulator += trade_profit
-                        is_bet_active = False
-                        logger.info(f"BET SOLD: Payout={payout:.8f}, Trade Profit={trade_profit:.8f}, Session Profit={session_profit_accumulator:.8f}")
-                        current_bet_entry_price = 0 # Reset for next bet
-                        current_bet_id = None
-
-                        if session_profit_accumulator >= config.SESSION_PROFIT_TARGET_SOL:
-                            logger.info(f"SESSION PROFIT TARGET REACHED: {session_profit_accumulator:.8f} >= {config.SESSION_PROFIT_TARGET_SOL}. Stopping bot.")
-                            break # Exit the main listening loop
-
-                    elif event_name == config.SOCKETIO_EVENT_BET_LOST:
-                        # IMPORTANT: Confirm the structure of this payload from RUGS.FUN
-                        # This event might occur on a rug pull or if a bet is liquidated by the game mechanics
-                        lost_amount = payload.get("amount", config.STAKE_AMOUNT) # Amount lost, usually the stake
-                        session_profit_accumulator -= lost_amount # Subtract the stake
-                        is_bet_active = False
-                        logger.info(f"BET LOST: Amount Lost={lost_amount:.8f}, Session Profit={session_profit_accumulator:.8f}")
-                        current_bet_entry_price = 0 # Reset for next bet
-                        current_bet_id = None
-                        # Check session target again, in case of losses (though less likely to hit target via loss)
-                        if session_profit_accumulator >= config.SESSION_PROFIT_TARGET_SOL:
-                            logger.info(f"SESSION PROFIT TARGET REACHED (unexpectedly after loss): {session_profit_accumulator:.8f} >= {config.SESSION_PROFIT_TARGET_SOL}. Stopping bot.")
-                            break
-
-                    # Optional: Client-side PING if server doesn't send PINGs or expects them more frequently
-                    # current_time = time.time()
-                    # if (current_time - last_ping_time) > config.PING_INTERVAL_SECONDS:
-                    #     await websocket.send('2') # Send Engine.IO PING
-                    #     last_ping_time = current_time
-                    #     logger.debug("Sent client-side Engine.IO PING")
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"WebSocket receive timeout after {config.PING_INTERVAL_SECONDS + 5}s. No message from server (or PING).")
-                    # Consider sending a PING here if the server might have just gone quiet
-                    current_time = time.time()
-                    if (current_time - last_ping_time) > config.PING_INTERVAL_SECONDS: # Check if we haven't PINGed recently
-                        logger.info("Timeout, sending PING to check connection.")
-                        await websocket.send('2') # Send Engine.IO PING
-                        last_ping_time = time.time()
-                    # If this happens repeatedly, the connection might be dead. The `async with` block will eventually exit.
-                except websockets.exceptions.ConnectionClosedOK:
-                    logger.info("WebSocket connection closed normally.")
-                    break
-                except websockets.exceptions.ConnectionClosedError as e:
-                    logger.error(f"WebSocket connection closed with error: {e}")
-                    break
-                except Exception as e:
-                    logger.exception(f"Error in WebSocket loop: {e}")
-                    await asyncio.sleep(1) # Avoid rapid looping on persistent error
+            state.last_ping_time = _now()
+            sender_task = asyncio.create_task(_sender(websocket, state.out_queue))
+
+            try:
+                while True:
+                    try:
+                        message = await websocket.recv()
+                        # Heartbeats are single-character frames; answer them before touching the parser
+                        if message == ENGINE_PING:
+                            _on_engine_ping(state)
+                            continue
+                        if message == ENGINE_PONG:
+                            _on_engine_pong(state)
+                            continue
+
+                        if message.startswith('42'):
+                            # Socket.IO event: decode straight into the event's typed payload
+                            try:
+                                event_name, raw_payload = _FRAME_DECODER.decode(message[2:])
+                                # Interned so the lookup hits the identity fast path against the config keys
+                                event_name = sys.intern(event_name)
+                                entry = state.handlers.get(event_name)
+                                if entry is None:
+                                    logger.debug("Ignoring Event: '%s', Payload: %s", event_name, raw_payload)
+                                    continue
+                                decoder, handler = entry
+                                event = decoder.decode(raw_payload)
+                            except msgspec.DecodeError as e:
+                                logger.warning("Could not decode Socket.IO event %.100s: %s", message, e)
+                                continue
+                            logger.debug("Received Event: '%s', Payload: %s", event_name, event)
+                            await handler(state, event)
+                            if state.stop_requested:
+                                break
+                            continue
+
+                        event_name, payload = utils.parse_socketio_message(message)
+                        if event_name == 'engine_open':
+                            _on_engine_open(state, payload)
+                        elif message: #If parse_socketio_message returned (None,None) but there was a message string
+                            logger.debug("Received unhandled message: %.100s...", message)
+
+                        # Optional: Client-side PING if server doesn't send PINGs or expects them more frequently
+                        # current_time = _now()
+                        # if (current_time - last_ping_time) > config.PING_INTERVAL_SECONDS:
+                        #     state.out_queue.put_nowait('2') # Send Engine.IO PING
+                        #     last_ping_time = current_time
+                        #     logger.debug("Sent client-side Engine.IO PING")
+
+                    except websockets.exceptions.ConnectionClosedOK:
+                        logger.info("WebSocket connection closed normally.")
+                        break
+                    except websockets.exceptions.ConnectionClosedError as e:
+                        logger.error("WebSocket connection closed with error: %s", e)
+                        break
+                    except Exception as e:
+                        logger.exception("Error in WebSocket loop: %s", e)
+                        await asyncio.sleep(1) # Avoid rapid looping on persistent error
+            finally:
+                sender_task.cancel()
 
             logger.info("Exited WebSocket listening loop.")
 
@@ -220,6 +408,7 @@ async def connect_and_listen():
 
 if __name__ == "__main__":
     logger.info("Starting RUGS.FUN Bot...")
+    utils.install_event_loop_policy()
     try:
         asyncio.run(connect_and_listen())
     except KeyboardInterrupt:
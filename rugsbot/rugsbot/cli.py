@@ -9,6 +9,7 @@ from pathlib import Path
 from . import config
 from . import bot
 from . import dev
+from . import utils
 from .validators import validate_config, validate_websocket_uri
 
 logger = logging.getLogger(__name__)
@@ -68,6 +69,7 @@ RUGSBOT_DEFAULT_ORIGIN=https://rugs.fun
 
 # Bot Behavior
 RUGSBOT_PING_INTERVAL_SECONDS=25
+RUGSBOT_PING_TIMEOUT_SECONDS=20
 RUGSBOT_LOG_LEVEL=INFO
 
 # Safety Features
@@ -226,6 +228,7 @@ Examples:
     if args.command == "setup":
         setup_wizard()
     elif args.command == "run":
+        utils.install_event_loop_policy()
         exit_code = asyncio.run(run_bot(args))
         sys.exit(exit_code)
     elif args.command == "dev":
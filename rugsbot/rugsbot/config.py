@@ -6,30 +6,46 @@ Values can be overridden with environment variables prefixed with
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_ENV_PREFIX = "RUGSBOT_"
+
+# Snapshot the ``RUGSBOT_`` overrides once (after ``.env`` is loaded) so each
+# setting below is a plain dict lookup rather than a query of ``os.environ``.
+_OVERRIDES = {
+    key[len(_ENV_PREFIX):]: value
+    for key, value in os.environ.items()
+    if key.startswith(_ENV_PREFIX)
+}
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _to_bool(value):
+    return value.lower() in _TRUTHY
+
+
+# Override parser per default type; types not listed keep the raw string.
+_COERCERS = {bool: _to_bool, int: int, float: float, str: str}
+
 
 def _env(name, default):
     """Return environment override for ``name`` or ``default`` if unset."""
-    value = os.getenv(f"RUGSBOT_{name}")
+    value = _OVERRIDES.get(name)
     if value is None:
         return default
 
-    if isinstance(default, bool):
-        return value.lower() in {"1", "true", "yes", "on"}
-    if isinstance(default, int):
-        try:
-            return int(value)
-        except ValueError:
-            return default
-    if isinstance(default, float):
-        try:
-            return float(value)
-        except ValueError:
-            return default
-    return value
+    coerce = _COERCERS.get(type(default))
+    if coerce is None:
+        return value
+    try:
+        return coerce(value)
+    except ValueError:
+        return default
 
 # --- WebSocket Connection Settings ---
 WEBSOCKET_URI = _env(
@@ -63,12 +79,13 @@ STOP_LOSS_MULTIPLIER = _env("STOP_LOSS_MULTIPLIER", 0.9)  # Stop loss at 90% of
 MAX_POSITION_TIME_SECONDS = _env("MAX_POSITION_TIME_SECONDS", 300)  # Maximum time to hold a position (5 minutes)
 
 # --- Socket.IO Event Names (Confirm these with RUGS.FUN actual messages) ---
-SOCKETIO_EVENT_PLACE_BET = _env("SOCKETIO_EVENT_PLACE_BET", "placeBet")
-SOCKETIO_EVENT_SELL_BET = _env("SOCKETIO_EVENT_SELL_BET", "sellBet")
-SOCKETIO_EVENT_GAME_STATE_UPDATE = _env("SOCKETIO_EVENT_GAME_STATE_UPDATE", "gameStateUpdate")
-SOCKETIO_EVENT_BET_PLACED = _env("SOCKETIO_EVENT_BET_PLACED", "betPlaced")  # Confirmation that your bet was accepted
-SOCKETIO_EVENT_BET_SOLD = _env("SOCKETIO_EVENT_BET_SOLD", "betSold")  # Confirmation that your bet was sold
-SOCKETIO_EVENT_BET_LOST = _env("SOCKETIO_EVENT_BET_LOST", "betLost")  # Confirmation if a bet is explicitly lost (e.g., rugged)
+# Interned so dispatch lookups against parsed event names can short-circuit on identity.
+SOCKETIO_EVENT_PLACE_BET = sys.intern(_env("SOCKETIO_EVENT_PLACE_BET", "placeBet"))
+SOCKETIO_EVENT_SELL_BET = sys.intern(_env("SOCKETIO_EVENT_SELL_BET", "sellBet"))
+SOCKETIO_EVENT_GAME_STATE_UPDATE = sys.intern(_env("SOCKETIO_EVENT_GAME_STATE_UPDATE", "gameStateUpdate"))
+SOCKETIO_EVENT_BET_PLACED = sys.intern(_env("SOCKETIO_EVENT_BET_PLACED", "betPlaced"))  # Confirmation that your bet was accepted
+SOCKETIO_EVENT_BET_SOLD = sys.intern(_env("SOCKETIO_EVENT_BET_SOLD", "betSold"))  # Confirmation that your bet was sold
+SOCKETIO_EVENT_BET_LOST = sys.intern(_env("SOCKETIO_EVENT_BET_LOST", "betLost"))  # Confirmation if a bet is explicitly lost (e.g., rugged)
 
 # --- Bot Behavior Settings ---
 PING_INTERVAL_SECONDS = _env(
@@ -76,7 +93,11 @@ PING_INTERVAL_SECONDS = _env(
     25,
 )  # Interval to send PING to keep connection alive (if server expects client PINGs)
 # Note: The provided example code handles server PINGs by sending PONGs.
-# This PING_INTERVAL_SECONDS would be for client-initiated PINGs if required.
+# PING_INTERVAL_SECONDS also drives the WebSocket-level keepalive pings sent by the client.
+PING_TIMEOUT_SECONDS = _env(
+    "PING_TIMEOUT_SECONDS",
+    20,
+)  # Close the connection if a keepalive ping is not answered within this many seconds
 
 LOG_LEVEL = _env("LOG_LEVEL", "INFO")  # Logging level (e.g., DEBUG, INFO, WARNING, ERROR)
 
@@ -2,11 +2,9 @@
 import argparse
 import asyncio
 import logging
-import websockets
 import sys
 
 from . import config
-from . import utils
 
 logging.basicConfig(level="INFO", format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -16,23 +14,37 @@ async def _dump_frames(num_frames: int) -> int:
 
     Returns an exit status code.
     """
+    # Imported here so ``--help`` doesn't pay for loading websockets
+    import websockets
+    from . import utils
+
     try:
         headers = {
             "User-Agent": config.DEFAULT_USER_AGENT,
             "Origin": config.DEFAULT_ORIGIN,
         }
+        # max_size=None: this is a capture tool, so don't drop oversized frames
         async with websockets.connect(
-            config.WEBSOCKET_URI, extra_headers=headers
+            config.WEBSOCKET_URI, extra_headers=headers, max_size=None
         ) as ws:
-            for i in range(num_frames):
-                msg = await ws.recv()
-                event, payload = utils.parse_socketio_message(msg)
-                if payload is None:
-                    logger.info("%d: %s", i + 1, event if event else msg)
-                    print(f"{i+1}: {event if event else msg}")
-                else:
-                    logger.info("%d: %s %s", i + 1, event, payload)
-                    print(f"{i+1}: {event} {payload}")
+            count = 0
+            if num_frames > 0:
+                async for msg in ws:
+                    count += 1
+                    event, payload = utils.parse_socketio_message(msg)
+                    if payload is None:
+                        logger.info("%d: %s", count, event if event else msg)
+                        print(f"{count}: {event if event else msg}")
+                    else:
+                        logger.info("%d: %s %s", count, event, payload)
+                        print(f"{count}: {event} {payload}")
+                    if count >= num_frames:
+                        break
+            if count < num_frames:
+                # A clean close ends iteration quietly; still fail so bad URIs/headers are noticed
+                logger.error("Connection closed after %d of %d frames", count, num_frames)
+                print(f"Error: connection closed after {count} of {num_frames} frames", file=sys.stderr)
+                return 1
         return 0
     except Exception as exc:
         logger.error("Error during connection: %s", exc)
@@ -1,19 +1,24 @@
 """Safety and risk management features for the RUGS.FUN Trading Bot."""
+import asyncio
 import time
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Deque, Optional
 from datetime import datetime, timedelta
 
 from . import config
 
 logger = logging.getLogger(__name__)
 
+# Number of closed/open trades kept in ``SafetyManager.trades``.
+MAX_TRADE_HISTORY = 1000
 
-@dataclass
+
+@dataclass(slots=True)
 class Trade:
     """Represents a single trade."""
-    entry_time: float
+    entry_time: float  # time.monotonic(), for measuring durations
     entry_price: float
     stake_amount: float
     bet_id: Optional[str] = None
@@ -23,12 +28,12 @@ class Trade:
     is_active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SafetyManager:
     """Manages safety features and risk controls."""
     
     # Daily tracking
-    daily_start_time: float = field(default_factory=time.time)
+    daily_start_time: float = field(default_factory=time.time)  # wall clock, for the calendar-day reset
     daily_profit: float = 0.0
     daily_loss: float = 0.0
     
@@ -36,8 +41,14 @@ class SafetyManager:
     consecutive_losses: int = 0
     consecutive_wins: int = 0
     
-    # Trade history
-    trades: List[Trade] = field(default_factory=list)
+    # Recent trade history, bounded so long sessions don't grow without limit
+    trades: Deque[Trade] = field(default_factory=lambda: deque(maxlen=MAX_TRADE_HISTORY))
+    
+    # Session counters, updated as trades close so stats never rescan history
+    _total_trades: int = field(default=0, init=False, repr=False)
+    _profitable_trades: int = field(default=0, init=False, repr=False)
+    _daily_trade_count: int = field(default=0, init=False, repr=False)
+    _daily_profitable_count: int = field(default=0, init=False, repr=False)
     
     # Current trade
     current_trade: Optional[Trade] = None
@@ -46,6 +57,22 @@ class SafetyManager:
     emergency_stop: bool = False
     stop_reason: Optional[str] = None
     
+    # Risk limits, copied from config once so the per-tick checks avoid module lookups
+    _max_daily_loss: float = field(init=False, repr=False)
+    _max_consecutive_losses: int = field(init=False, repr=False)
+    _profit_target: float = field(init=False, repr=False)
+    _stop_loss_multiplier: float = field(init=False, repr=False)
+    _max_position_time: float = field(init=False, repr=False)
+    _dry_run: bool = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self._max_daily_loss = config.MAX_DAILY_LOSS
+        self._max_consecutive_losses = config.MAX_CONSECUTIVE_LOSSES
+        self._profit_target = config.PER_TRADE_PROFIT_MULTIPLIER_TARGET
+        self._stop_loss_multiplier = config.STOP_LOSS_MULTIPLIER
+        self._max_position_time = config.MAX_POSITION_TIME_SECONDS
+        self._dry_run = config.DRY_RUN
+    
     def should_place_bet(self, current_price: float) -> tuple[bool, str]:
         """Check if it's safe to place a bet.
         
@@ -64,26 +91,27 @@ class SafetyManager:
             return False, "Already in an active position"
         
         # Check daily loss limit
-        if self.daily_loss >= config.MAX_DAILY_LOSS:
+        if self.daily_loss >= self._max_daily_loss:
             self.trigger_emergency_stop(f"Daily loss limit reached: {self.daily_loss:.6f} SOL")
             return False, f"Daily loss limit reached: {self.daily_loss:.6f} SOL"
         
         # Check consecutive losses
-        if self.consecutive_losses >= config.MAX_CONSECUTIVE_LOSSES:
+        if self.consecutive_losses >= self._max_consecutive_losses:
             self.trigger_emergency_stop(f"Max consecutive losses reached: {self.consecutive_losses}")
             return False, f"Max consecutive losses reached: {self.consecutive_losses}"
         
         # Check if we're in dry run mode
-        if config.DRY_RUN:
+        if self._dry_run:
             logger.info("🧪 DRY RUN: Would place bet but simulating only")
         
         return True, "Safe to place bet"
     
-    def should_sell_position(self, current_price: float) -> tuple[bool, str]:
+    def should_sell_position(self, current_price: float, now: Optional[float] = None) -> tuple[bool, str]:
         """Check if we should sell the current position.
         
         Args:
             current_price: Current market price
+            now: time.monotonic() reading for this decision cycle (read if omitted)
             
         Returns:
             Tuple of (should_sell, reason)
@@ -91,7 +119,7 @@ class SafetyManager:
         if not self.current_trade or not self.current_trade.is_active:
             return False, "No active position"
         
-        current_time = time.time()
+        current_time = now if now is not None else time.monotonic()
         entry_price = self.current_trade.entry_price
         entry_time = self.current_trade.entry_time
         
@@ -99,16 +127,16 @@ class SafetyManager:
         profit_multiplier = current_price / entry_price
         
         # Check profit target
-        if profit_multiplier >= config.PER_TRADE_PROFIT_MULTIPLIER_TARGET:
+        if profit_multiplier >= self._profit_target:
             return True, f"Profit target reached: {profit_multiplier:.4f}x"
         
         # Check stop loss
-        if profit_multiplier <= config.STOP_LOSS_MULTIPLIER:
+        if profit_multiplier <= self._stop_loss_multiplier:
             return True, f"Stop loss triggered: {profit_multiplier:.4f}x"
         
         # Check maximum position time
         position_time = current_time - entry_time
-        if position_time >= config.MAX_POSITION_TIME_SECONDS:
+        if position_time >= self._max_position_time:
             return True, f"Max position time reached: {position_time:.0f}s"
         
         # Check emergency stop
@@ -117,13 +145,15 @@ class SafetyManager:
         
         return False, f"Hold position (current: {profit_multiplier:.4f}x)"
     
-    def start_trade(self, entry_price: float, stake_amount: float, bet_id: str = None) -> Trade:
+    def start_trade(self, entry_price: float, stake_amount: float, bet_id: str = None,
+                    now: Optional[float] = None) -> Trade:
         """Start a new trade.
         
         Args:
             entry_price: Entry price for the trade
             stake_amount: Amount staked
             bet_id: Optional bet ID from the exchange
+            now: time.monotonic() reading for this decision cycle (read if omitted)
             
         Returns:
             The created Trade object
@@ -132,7 +162,7 @@ class SafetyManager:
             logger.warning("Starting new trade while previous trade is still active!")
         
         self.current_trade = Trade(
-            entry_time=time.time(),
+            entry_time=now if now is not None else time.monotonic(),
             entry_price=entry_price,
             stake_amount=stake_amount,
             bet_id=bet_id
@@ -140,19 +170,21 @@ class SafetyManager:
         
         self.trades.append(self.current_trade)
         
-        if config.DRY_RUN:
+        if self._dry_run:
             logger.info(f"🧪 DRY RUN: Simulated trade started - Entry: {entry_price:.6f}, Stake: {stake_amount:.6f}")
         else:
             logger.info(f"💰 Trade started - Entry: {entry_price:.6f}, Stake: {stake_amount:.6f}, ID: {bet_id}")
         
         return self.current_trade
     
-    def close_trade(self, exit_price: float, payout: float = None) -> Optional[Trade]:
+    def close_trade(self, exit_price: float, payout: float = None,
+                    now: Optional[float] = None) -> Optional[Trade]:
         """Close the current trade.
         
         Args:
             exit_price: Exit price for the trade
             payout: Total payout received (optional)
+            now: time.monotonic() reading for this decision cycle (read if omitted)
             
         Returns:
             The closed Trade object or None if no active trade
@@ -170,13 +202,17 @@ class SafetyManager:
             profit = self.current_trade.stake_amount * (profit_multiplier - 1)
         
         # Update trade
-        self.current_trade.exit_time = time.time()
+        self.current_trade.exit_time = now if now is not None else time.monotonic()
         self.current_trade.exit_price = exit_price
         self.current_trade.profit = profit
         self.current_trade.is_active = False
         
-        # Update daily tracking
+        # Update session and daily tracking
+        self._total_trades += 1
+        self._daily_trade_count += 1
         if profit > 0:
+            self._profitable_trades += 1
+            self._daily_profitable_count += 1
             self.daily_profit += profit
             self.consecutive_wins += 1
             self.consecutive_losses = 0
@@ -189,7 +225,7 @@ class SafetyManager:
         trade_duration = self.current_trade.exit_time - self.current_trade.entry_time
         profit_multiplier = exit_price / self.current_trade.entry_price
         
-        if config.DRY_RUN:
+        if self._dry_run:
             logger.info(f"🧪 DRY RUN: Simulated trade closed")
         
         if profit > 0:
@@ -211,23 +247,39 @@ class SafetyManager:
         self.stop_reason = reason
         logger.error(f"🚨 EMERGENCY STOP TRIGGERED: {reason}")
     
-    def reset_daily_stats(self):
-        """Reset daily statistics (call at start of new day)."""
-        current_time = time.time()
+    def reset_daily_stats(self, wall_now: Optional[float] = None):
+        """Reset daily statistics (call at start of new day).
+        
+        Args:
+            wall_now: Wall-clock ``time.time()`` reading (read if omitted). Not the
+                monotonic ``now`` taken by the trade methods.
+        """
+        current_time = wall_now if wall_now is not None else time.time()
         if current_time - self.daily_start_time >= 86400:  # 24 hours
             logger.info("📅 Resetting daily statistics")
             self.daily_start_time = current_time
             self.daily_profit = 0.0
             self.daily_loss = 0.0
+            self._daily_trade_count = 0
+            self._daily_profitable_count = 0
+    
+    async def daily_reset_loop(self, interval: float = 60.0):
+        """Periodically roll the daily statistics over, off the trading path.
+        
+        Start once with ``asyncio.create_task(manager.daily_reset_loop())``
+        and cancel the task on shutdown.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.reset_daily_stats()
     
     def _log_stats(self):
         """Log current trading statistics."""
-        total_trades = len(self.trades)
+        total_trades = self._total_trades
         if total_trades == 0:
             return
         
-        profitable_trades = sum(1 for t in self.trades if t.profit and t.profit > 0)
-        win_rate = (profitable_trades / total_trades) * 100
+        win_rate = (self._profitable_trades / total_trades) * 100
         
         net_profit = self.daily_profit - self.daily_loss
         
@@ -237,9 +289,8 @@ class SafetyManager:
     
     def get_daily_stats(self) -> dict:
         """Get daily statistics summary."""
-        total_trades = len([t for t in self.trades if t.entry_time >= self.daily_start_time])
-        profitable_trades = len([t for t in self.trades 
-                               if t.entry_time >= self.daily_start_time and t.profit and t.profit > 0])
+        total_trades = self._daily_trade_count
+        profitable_trades = self._daily_profitable_count
         
         win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
         net_profit = self.daily_profit - self.daily_loss
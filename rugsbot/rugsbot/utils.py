@@ -1,25 +1,106 @@
 """
 Utility functions for the RUGS.FUN Trading Bot.
 """
+import asyncio
 import json
 import logging
+import sys
+
+from websockets.exceptions import ConnectionClosed
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
-async def send_socketio_message(websocket, event_name: str, payload: dict):
-    """Constructs and sends a Socket.IO message (event type '42')."""
-    if not websocket or not websocket.open:
-        logger.warning(f"WebSocket not open. Cannot send {event_name}.")
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only need
+# to handle the stdlib exception whichever backend is active.
+if orjson is not None:
+    def _json_loads_from(message: str, start: int):
+        """Decodes the JSON value that begins at ``message[start]``."""
+        # orjson has no offset API; its parse is cheap enough to absorb the slice.
+        return orjson.loads(message[start:])
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _DECODER = json.JSONDecoder()
+    _WHITESPACE = json.decoder.WHITESPACE
+
+    def _json_loads_from(message: str, start: int):
+        """Decodes the JSON value that begins at ``message[start]``."""
+        # raw_decode parses in place from the offset, skipping the prefix copy.
+        # Unlike json.loads it stops after the first value, so reject anything
+        # but whitespace after it to match json.loads/orjson.
+        obj, end = _DECODER.raw_decode(message, _WHITESPACE.match(message, start).end())
+        end = _WHITESPACE.match(message, end).end()
+        if end != len(message):
+            raise json.JSONDecodeError("Extra data", message, end)
+        return obj
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+def install_event_loop_policy():
+    """Switch asyncio to the fastest event loop available.
+
+    Must be called before ``asyncio.run``. On Linux ``uringcore`` (io_uring) is
+    preferred when installed, then ``uvloop``; otherwise the default asyncio
+    event loop is kept (e.g. on Windows).
+    """
+    if sys.platform == "linux":
+        try:
+            import uringcore
+        except ImportError:
+            pass
+        else:
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+            logger.debug("Using uringcore event loop.")
+            return
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop.")
         return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop.")
+
+# Socket.IO framing is done by hand on purpose: outbound frames are built once
+# (see StrategySettings) and inbound events decode straight into typed structs,
+# which a full Socket.IO client's dispatch layer would only add overhead to.
+# Event name -> encoded '42["eventName",' envelope prefix, filled on first use.
+_FRAME_PREFIXES = {}
+
+def build_socketio_frame(event_name: str, payload: dict) -> str:
+    """Encodes a Socket.IO event message (type '42') ready to be sent as-is."""
+    prefix = _FRAME_PREFIXES.get(event_name)
+    if prefix is None:
+        prefix = _FRAME_PREFIXES[event_name] = f"42[{_json_dumps(event_name)},"
+    return f"{prefix}{_json_dumps(payload)}]"
 
+async def send_socketio_message(websocket, event_name: str, payload: dict):
+    """Constructs and sends a Socket.IO message (event type '42')."""
     try:
-        message_data = [event_name, payload]
-        socketio_message = f"42{json.dumps(message_data)}"
-        logger.debug(f"Sending Socket.IO message: {socketio_message}")
+        socketio_message = build_socketio_frame(event_name, payload)
+        logger.debug("Sending Socket.IO message: %s", socketio_message)
         await websocket.send(socketio_message)
-        logger.info(f"Sent: Event='{event_name}', Payload={payload}")
+        logger.info("Sent: Event='%s', Payload=%s", event_name, payload)
+    except ConnectionClosed:
+        logger.warning("WebSocket not open. Cannot send %s.", event_name)
     except Exception as e:
-        logger.error(f"Error sending Socket.IO message {event_name} with payload {payload}: {e}")
+        logger.error("Error sending Socket.IO message %s with payload %s: %s", event_name, payload, e)
+
+# Engine.IO heartbeat packets, sent as single-character text frames.
+ENGINE_PING = '2'
+ENGINE_PONG = '3'
+
+# Single-character Engine.IO frames and their parse results.
+_HEARTBEAT_FRAMES = {
+    ENGINE_PING: ('engine_ping', None), # Engine.IO PING from server
+    ENGINE_PONG: ('engine_pong', None), # Engine.IO PONG from server (or our PONG ack)
+}
 
 def parse_socketio_message(message: str):
     """
@@ -27,29 +108,30 @@ def parse_socketio_message(message: str):
     Returns a tuple (event_name, payload_dict) or (None, None) if parsing fails or not an event.
     Handles Engine.IO PING ('2') and PONG ('3') as special cases, returning (message_type, None).
     """
-    if message == '2': # Engine.IO PING from server
-        return 'engine_ping', None
-    if message == '3': # Engine.IO PONG from server (or our PONG ack)
-        return 'engine_pong', None
-
-    if message.startswith('42'): # Socket.IO event message (JSON array)
-        try:
-            data_str = message[2:] # Remove the '42'
-            event_name, payload = json.loads(data_str)
-            return event_name, payload
-        except json.JSONDecodeError:
-            logger.warning(f"Could not decode JSON from Socket.IO message: {message}")
-            return None, None
-        except ValueError: # If json.loads(data_str) doesn't return a list of 2 elements
-             logger.warning(f"Socket.IO message data is not a list of two elements: {data_str}")
-             return None, None
-    elif message.startswith('0{'): # Engine.IO OPEN message with session info
+    # Branch on the Engine.IO packet type character(s) directly rather than
+    # running a chain of equality and startswith checks on every frame.
+    if len(message) < 2:
+        heartbeat = _HEARTBEAT_FRAMES.get(message)
+        if heartbeat is not None:
+            return heartbeat
+    elif message[0] == '4':
+        if message[1] == '2': # Socket.IO event message (JSON array)
+            try:
+                event_name, payload = _json_loads_from(message, 2) # Skip the '42'
+                return sys.intern(event_name), payload
+            except json.JSONDecodeError:
+                logger.warning("Could not decode JSON from Socket.IO message: %s", message)
+                return None, None
+            except (ValueError, TypeError): # Not a list of 2 elements, or the event name is not a string
+                 logger.warning("Socket.IO message data is not a list of two elements: %s", message[2:])
+                 return None, None
+    elif message[0] == '0' and message[1] == '{': # Engine.IO OPEN message with session info
         try:
-            payload = json.loads(message[1:])
+            payload = _json_loads_from(message, 1)
             return 'engine_open', payload
         except json.JSONDecodeError:
-            logger.warning(f"Could not decode JSON from Engine.IO OPEN message: {message}")
+            logger.warning("Could not decode JSON from Engine.IO OPEN message: %s", message)
             return None, None
     
-    logger.debug(f"Received non-standard message or unhandled Engine.IO message: {message[:50]}...")
+    logger.debug("Received non-standard message or unhandled Engine.IO message: %.50s...", message)
     return None, None # Not a recognized Socket.IO event message or Engine.IO PING/PONG/OPEN 
\ No newline at end of file
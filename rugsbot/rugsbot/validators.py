@@ -1,14 +1,37 @@
 """Configuration and connection validators for the RUGS.FUN Trading Bot."""
 import asyncio
+import functools
 import logging
-import websockets
 from typing import Dict, List, Tuple
-from urllib.parse import urlparse
 
 from . import config
 
 logger = logging.getLogger(__name__)
 
+# (config name, accepted types, predicate, requirement shown in the error)
+_VALIDATIONS = [
+    # Trading parameters
+    ("STAKE_AMOUNT", (int, float), lambda v: v > 0, "must be a positive number"),
+    ("PER_TRADE_PROFIT_MULTIPLIER_TARGET", (int, float), lambda v: v > 1.0, "must be > 1.0"),
+    ("SESSION_PROFIT_TARGET_SOL", (int, float), lambda v: v > 0, "must be positive"),
+    ("MAX_BUY_WINDOW_SECONDS", (int, float), lambda v: v > 0, "must be positive"),
+    ("DYNAMIC_BUY_PRICE_CEILING", (int, float), lambda v: v > 0, "must be positive"),
+    # Timing parameters
+    ("PING_INTERVAL_SECONDS", (int, float), lambda v: v > 0, "must be positive"),
+    ("PING_TIMEOUT_SECONDS", (int, float), lambda v: v > 0, "must be positive"),
+    # Safety features
+    ("MAX_DAILY_LOSS", (int, float), lambda v: v > 0, "must be positive"),
+    ("MAX_CONSECUTIVE_LOSSES", int, lambda v: v > 0, "must be a positive integer"),
+]
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_ws_uri(uri: str):
+    """Parse ``uri`` once; repeated validation of the same URI reuses the result."""
+    from urllib.parse import urlparse
+
+    return urlparse(uri)
+
 
 def validate_config() -> bool:
     """Validate bot configuration settings.
@@ -24,7 +47,7 @@ def validate_config() -> bool:
         errors.append("WebSocket URI is not configured. Please set RUGSBOT_WEBSOCKET_URI")
     else:
         try:
-            parsed = urlparse(config.WEBSOCKET_URI)
+            parsed = _parse_ws_uri(config.WEBSOCKET_URI)
             if not parsed.scheme in ['ws', 'wss']:
                 errors.append(f"WebSocket URI must use ws:// or wss:// scheme, got: {parsed.scheme}")
             if not parsed.netloc:
@@ -32,25 +55,11 @@ def validate_config() -> bool:
         except Exception as e:
             errors.append(f"Invalid WebSocket URI format: {e}")
     
-    # Validate trading parameters
-    if not isinstance(config.STAKE_AMOUNT, (int, float)) or config.STAKE_AMOUNT <= 0:
-        errors.append(f"STAKE_AMOUNT must be a positive number, got: {config.STAKE_AMOUNT}")
-    
-    if not isinstance(config.PER_TRADE_PROFIT_MULTIPLIER_TARGET, (int, float)) or config.PER_TRADE_PROFIT_MULTIPLIER_TARGET <= 1.0:
-        errors.append(f"PER_TRADE_PROFIT_MULTIPLIER_TARGET must be > 1.0, got: {config.PER_TRADE_PROFIT_MULTIPLIER_TARGET}")
-    
-    if not isinstance(config.SESSION_PROFIT_TARGET_SOL, (int, float)) or config.SESSION_PROFIT_TARGET_SOL <= 0:
-        errors.append(f"SESSION_PROFIT_TARGET_SOL must be positive, got: {config.SESSION_PROFIT_TARGET_SOL}")
-    
-    if not isinstance(config.MAX_BUY_WINDOW_SECONDS, (int, float)) or config.MAX_BUY_WINDOW_SECONDS <= 0:
-        errors.append(f"MAX_BUY_WINDOW_SECONDS must be positive, got: {config.MAX_BUY_WINDOW_SECONDS}")
-    
-    if not isinstance(config.DYNAMIC_BUY_PRICE_CEILING, (int, float)) or config.DYNAMIC_BUY_PRICE_CEILING <= 0:
-        errors.append(f"DYNAMIC_BUY_PRICE_CEILING must be positive, got: {config.DYNAMIC_BUY_PRICE_CEILING}")
-    
-    # Validate timing parameters
-    if not isinstance(config.PING_INTERVAL_SECONDS, (int, float)) or config.PING_INTERVAL_SECONDS <= 0:
-        errors.append(f"PING_INTERVAL_SECONDS must be positive, got: {config.PING_INTERVAL_SECONDS}")
+    # Validate numeric parameters
+    for name, expected_type, is_valid, requirement in _VALIDATIONS:
+        value = getattr(config, name, None)
+        if not isinstance(value, expected_type) or not is_valid(value):
+            errors.append(f"{name} {requirement}, got: {value}")
     
     # Validate string parameters
     if not config.DEFAULT_USER_AGENT:
@@ -69,15 +78,6 @@ def validate_config() -> bool:
     if config.MAX_BUY_WINDOW_SECONDS > 30:
         warnings.append(f"Buy window is quite long ({config.MAX_BUY_WINDOW_SECONDS}s). This might miss early opportunities.")
     
-    # Check for safety features
-    if hasattr(config, 'MAX_DAILY_LOSS'):
-        if not isinstance(config.MAX_DAILY_LOSS, (int, float)) or config.MAX_DAILY_LOSS <= 0:
-            errors.append(f"MAX_DAILY_LOSS must be positive, got: {config.MAX_DAILY_LOSS}")
-    
-    if hasattr(config, 'MAX_CONSECUTIVE_LOSSES'):
-        if not isinstance(config.MAX_CONSECUTIVE_LOSSES, int) or config.MAX_CONSECUTIVE_LOSSES <= 0:
-            errors.append(f"MAX_CONSECUTIVE_LOSSES must be a positive integer, got: {config.MAX_CONSECUTIVE_LOSSES}")
-    
     # Display results
     if warnings:
         logger.warning("⚠️  Configuration Warnings:")
@@ -104,23 +104,27 @@ async def validate_websocket_uri(uri: str, timeout: float = 10.0) -> bool:
     Returns:
         bool: True if connection successful, False otherwise
     """
+    # Imported here so config-only commands don't pay for loading websockets
+    import websockets
+
     try:
         headers = {
             "User-Agent": config.DEFAULT_USER_AGENT,
             "Origin": config.DEFAULT_ORIGIN
         }
         
-        async with asyncio.timeout(timeout):
-            async with websockets.connect(uri, extra_headers=headers) as websocket:
-                # Try to receive one message to verify the connection is active
-                try:
-                    message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    logger.debug(f"Received test message: {message[:100]}...")
-                    return True
-                except asyncio.TimeoutError:
-                    # No message received, but connection was successful
-                    logger.debug("Connection successful but no immediate message received")
-                    return True
+        # open_timeout bounds the handshake, so no outer timeout is needed
+        async with websockets.connect(uri, extra_headers=headers, open_timeout=timeout) as websocket:
+            # Try to receive one message to verify the connection is active
+            try:
+                async with asyncio.timeout(5.0):
+                    message = await websocket.recv()
+                logger.debug("Received test message: %.100s...", message)
+                return True
+            except asyncio.TimeoutError:
+                # No message received, but connection was successful
+                logger.debug("Connection successful but no immediate message received")
+                return True
                     
     except asyncio.TimeoutError:
         logger.error(f"Connection timeout after {timeout}s")
@@ -179,6 +183,7 @@ def get_config_summary() -> Dict[str, any]:
         "buy_window": config.MAX_BUY_WINDOW_SECONDS,
         "price_ceiling": config.DYNAMIC_BUY_PRICE_CEILING,
         "ping_interval": config.PING_INTERVAL_SECONDS,
+        "ping_timeout": config.PING_TIMEOUT_SECONDS,
         "log_level": config.LOG_LEVEL,
         "dry_run": getattr(config, 'DRY_RUN', False),
         "max_daily_loss": getattr(config, 'MAX_DAILY_LOSS', None),
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import time
+
+from rugsbot.bot import (
+    _ACTIVE_TICK_HANDLER,
+    _FRAME_DECODER,
+    _IDLE_TICK_HANDLER,
+    _sender,
+    BotState,
+    GameStateUpdate,
+    StrategySettings,
+)
+
+
+class FakeWebSocket:
+    """Minimal stand-in that records outbound frames."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+def _settings(**overrides):
+    values = dict(
+        stake_amount=0.01,
+        profit_target=1.03,
+        session_profit_target=0.05,
+        buy_window_seconds=5,
+        buy_price_ceiling=1.5,
+    )
+    values.update(overrides)
+    return StrategySettings(**values)
+
+
+def _queued_events(state):
+    events = []
+    while not state.out_queue.empty():
+        events.append(json.loads(state.out_queue.get_nowait()[2:])[0])
+    return events
+
+
+def _dispatch(state, frame):
+    event_name, raw_payload = _FRAME_DECODER.decode(frame[2:])
+    decoder, handler = state.handlers[event_name]
+    asyncio.run(handler(state, decoder.decode(raw_payload)))
+
+
+def _tick(state, update):
+    _, handler = state.handlers["gameStateUpdate"]
+    asyncio.run(handler(state, update))
+
+
+def test_buy_placed_early_in_round_below_ceiling():
+    """Test that a bet is placed when price and timing conditions are met"""
+    state = BotState(settings=_settings())
+    _tick(state, GameStateUpdate(price=1.0, tick=1, active=True))
+    assert _queued_events(state) == ["placeBet"]
+
+
+def test_prebuilt_frames_use_session_settings():
+    """Test that the cached buy/sell frames encode the session's stake"""
+    settings = _settings(stake_amount=0.02)
+    assert json.loads(settings.buy_frame[2:]) == [
+        "placeBet",
+        {"amount": 0.02, "autoSellMultiplier": None, "stopLossMultiplier": None},
+    ]
+    assert json.loads(settings.sell_frame[2:]) == ["sellBet", {"percentage": 100}]
+
+
+def test_no_buy_above_price_ceiling():
+    """Test that no bet is placed when price exceeds the ceiling"""
+    state = BotState(settings=_settings(buy_price_ceiling=0.5))
+    _tick(state, GameStateUpdate(price=1.0, tick=1, active=True))
+    assert state.out_queue.empty()
+
+
+def test_no_buy_after_buy_window():
+    """Test that no bet is placed once the round's buy window has passed"""
+    state = BotState(settings=_settings(), round_started_logged=True, buy_deadline=time.monotonic() - 5)
+    _tick(state, GameStateUpdate(price=1.0, tick=50, active=True))
+    assert state.out_queue.empty()
+    _tick(state, GameStateUpdate(price=1.0, tick=0, active=False))
+    assert not state.round_started_logged
+
+
+def test_state_built_with_active_bet_gets_active_tick_handler():
+    """Test that the tick handler follows is_bet_active from construction"""
+    assert BotState(settings=_settings()).handlers["gameStateUpdate"] is _IDLE_TICK_HANDLER
+    state = BotState(settings=_settings(), is_bet_active=True, current_bet_entry_price=1.0, sell_trigger_price=1.03)
+    assert state.handlers["gameStateUpdate"] is _ACTIVE_TICK_HANDLER
+    _tick(state, GameStateUpdate(price=1.0, tick=1, active=True))
+    assert state.out_queue.empty()
+
+
+def test_sell_when_profit_target_reached():
+    """Test that an active bet is sold once the profit target is hit"""
+    state = BotState(settings=_settings(), is_bet_active=True, current_bet_entry_price=1.0, sell_trigger_price=1.03)
+    _tick(state, GameStateUpdate(price=1.02, tick=2, active=True))
+    assert state.out_queue.empty()
+    _tick(state, GameStateUpdate(price=1.05, tick=3, active=True))
+    assert _queued_events(state) == ["sellBet"]
+
+
+def test_bet_lifecycle_stops_at_session_target():
+    """Test that betPlaced arms the sell trigger and betSold can end the session"""
+    state = BotState(settings=_settings(session_profit_target=0.0005))
+    _dispatch(state, '42["betPlaced",{"entryPrice":1.0,"amount":0.01,"id":"abc"}]')
+    assert state.is_bet_active
+    assert state.current_bet_id == "abc"
+    assert state.sell_trigger_price == 1.03
+    assert state.handlers["gameStateUpdate"] is _ACTIVE_TICK_HANDLER
+    _dispatch(state, '42["betSold",{"payout":0.011}]')
+    assert not state.is_bet_active
+    assert state.sell_trigger_price == 0.0
+    assert state.handlers["gameStateUpdate"] is _IDLE_TICK_HANDLER
+    assert state.stop_requested
+
+
+def test_game_state_update_coerces_loose_types():
+    """Test that a float tick and a 0/1 active flag still reach the tick handler"""
+    state = BotState(settings=_settings())
+    _dispatch(state, '42["gameStateUpdate",{"price":1.0,"tick":4.0,"active":1}]')
+    assert _queued_events(state) == ["placeBet"]
+
+
+def test_bet_placed_falls_back_to_price_field():
+    """Test that betPlaced uses 'price' when 'entryPrice' is missing"""
+    state = BotState(settings=_settings())
+    _dispatch(state, '42["betPlaced",{"price":2.0}]')
+    assert state.current_bet_entry_price == 2.0
+
+
+def test_sender_drains_queue_in_order():
+    """Test that the sender task writes queued frames to the socket in order"""
+    async def run():
+        websocket = FakeWebSocket()
+        queue = asyncio.Queue()
+        task = asyncio.create_task(_sender(websocket, queue))
+        for frame in ("3", '42["sellBet",{"percentage": 100}]'):
+            queue.put_nowait(frame)
+        while not queue.empty():
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        return websocket.sent
+
+    assert asyncio.run(run()) == ["3", '42["sellBet",{"percentage": 100}]']
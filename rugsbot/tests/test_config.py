@@ -0,0 +1,25 @@
+from rugsbot import config
+
+
+def test_env_returns_default_when_unset(monkeypatch):
+    """Test that settings without an override keep their default"""
+    monkeypatch.delitem(config._OVERRIDES, "STAKE_AMOUNT", raising=False)
+    assert config._env("STAKE_AMOUNT", 0.01) == 0.01
+
+
+def test_env_coerces_to_default_type(monkeypatch):
+    """Test that overrides are converted to the type of the default"""
+    monkeypatch.setitem(config._OVERRIDES, "STAKE_AMOUNT", "0.5")
+    monkeypatch.setitem(config._OVERRIDES, "MAX_CONSECUTIVE_LOSSES", "3")
+    monkeypatch.setitem(config._OVERRIDES, "DRY_RUN", "Yes")
+    monkeypatch.setitem(config._OVERRIDES, "DEFAULT_ORIGIN", "https://example.com")
+    assert config._env("STAKE_AMOUNT", 0.01) == 0.5
+    assert config._env("MAX_CONSECUTIVE_LOSSES", 5) == 3
+    assert config._env("DRY_RUN", False) is True
+    assert config._env("DEFAULT_ORIGIN", "https://rugs.fun") == "https://example.com"
+
+
+def test_env_falls_back_on_invalid_number(monkeypatch):
+    """Test that an unparseable numeric override falls back to the default"""
+    monkeypatch.setitem(config._OVERRIDES, "MAX_CONSECUTIVE_LOSSES", "many")
+    assert config._env("MAX_CONSECUTIVE_LOSSES", 5) == 5
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+
+from rugsbot import config
+from rugsbot.safety import SafetyManager
+
+
+def test_sell_on_profit_target_and_stop_loss():
+    """Test that an open position is sold at the profit target or stop loss"""
+    manager = SafetyManager()
+    manager.start_trade(entry_price=1.0, stake_amount=0.01)
+    assert manager.should_sell_position(1.0)[0] is False
+    assert manager.should_sell_position(config.PER_TRADE_PROFIT_MULTIPLIER_TARGET)[0] is True
+    assert manager.should_sell_position(config.STOP_LOSS_MULTIPLIER)[0] is True
+
+
+def test_close_trade_with_payout_updates_daily_totals():
+    """Test that profit is taken from the payout and stake"""
+    manager = SafetyManager()
+    manager.start_trade(entry_price=1.0, stake_amount=0.02)
+    trade = manager.close_trade(exit_price=1.05, payout=0.021)
+    assert abs(trade.profit - 0.001) < 1e-12
+    assert abs(manager.daily_profit - 0.001) < 1e-12
+    assert manager.consecutive_wins == 1
+    assert manager.current_trade is None
+
+
+def test_consecutive_losses_trigger_emergency_stop():
+    """Test that too many losses in a row block new bets"""
+    manager = SafetyManager()
+    for _ in range(config.MAX_CONSECUTIVE_LOSSES):
+        manager.start_trade(entry_price=1.0, stake_amount=0.001)
+        manager.close_trade(exit_price=0.95)
+    should_place, _ = manager.should_place_bet(1.0)
+    assert should_place is False
+    assert manager.emergency_stop
+
+
+def test_trade_history_is_bounded(monkeypatch):
+    """Test that only recent trades are kept while session stats keep counting"""
+    monkeypatch.setattr("rugsbot.safety.MAX_TRADE_HISTORY", 3)
+    manager = SafetyManager()
+    for _ in range(5):
+        manager.start_trade(entry_price=1.0, stake_amount=0.001)
+        manager.close_trade(exit_price=1.1)
+    assert len(manager.trades) == 3
+    assert manager._total_trades == 5
+    assert manager._profitable_trades == 5
+
+
+def test_daily_stats_reset_after_a_day():
+    """Test that daily counters cover closed trades since the last daily reset"""
+    manager = SafetyManager()
+    manager.start_trade(entry_price=1.0, stake_amount=0.01)
+    manager.close_trade(exit_price=1.1)
+    manager.start_trade(entry_price=1.0, stake_amount=0.01)
+    manager.close_trade(exit_price=0.9)
+    stats = manager.get_daily_stats()
+    assert stats["total_trades"] == 2
+    assert stats["profitable_trades"] == 1
+    assert stats["win_rate"] == 50
+
+    manager.reset_daily_stats(wall_now=manager.daily_start_time + 86400)
+    stats = manager.get_daily_stats()
+    assert stats["total_trades"] == 0
+    assert stats["daily_loss"] == 0.0
+
+
+def test_sell_after_max_position_time_with_injected_clock():
+    """Test that position age is measured against the caller's timestamp"""
+    manager = SafetyManager()
+    manager.start_trade(entry_price=1.0, stake_amount=0.01, now=1000.0)
+    should_sell, _ = manager.should_sell_position(1.0, now=1001.0)
+    assert not should_sell
+    should_sell, reason = manager.should_sell_position(1.0, now=1000.0 + manager._max_position_time)
+    assert should_sell
+    assert reason.startswith("Max position time")
+    trade = manager.close_trade(exit_price=1.0, now=1010.0)
+    assert trade.exit_time - trade.entry_time == 10.0
+
+
+def test_daily_reset_loop_rolls_over_stale_day():
+    """Test that the background reset loop clears totals once a day has passed"""
+    async def run():
+        manager = SafetyManager(daily_loss=0.02, daily_start_time=time.time() - 86400)
+        task = asyncio.create_task(manager.daily_reset_loop(interval=0))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+        return manager
+
+    manager = asyncio.run(run())
+    assert manager.daily_loss == 0.0
+
+
+def test_reset_daily_stats_rejects_monotonic_now():
+    """Test that the trade methods' monotonic ``now`` can't be passed to the daily reset"""
+    manager = SafetyManager()
+    with pytest.raises(TypeError):
+        manager.reset_daily_stats(now=time.monotonic())
+    manager.daily_loss = 0.02
+    manager.reset_daily_stats(wall_now=time.time())
+    assert manager.daily_loss == 0.02
+    manager.reset_daily_stats(wall_now=time.time() + 86400)
+    assert manager.daily_loss == 0.0
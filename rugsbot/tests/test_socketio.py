@@ -1,6 +1,8 @@
+import importlib
 import pytest
 import json
-from rugsbot.utils import parse_socketio_message
+import sys
+from rugsbot.utils import build_socketio_frame, parse_socketio_message
 
 def test_engine_io_ping():
     """Test parsing Engine.IO PING messages"""
@@ -39,4 +41,41 @@ def test_unrecognized_message_returns_none():
     """Test that unrecognized messages return None for both event and payload"""
     event, payload = parse_socketio_message("foobar")
     assert event is None
-    assert payload is None 
\ No newline at end of file
+    assert payload is None
+
+def test_malformed_socketio_event_returns_none():
+    """Test that an event frame with invalid JSON is rejected cleanly"""
+    event, payload = parse_socketio_message('42["gameStateUpdate",{"price":')
+    assert event is None
+    assert payload is None
+
+def test_socketio_event_name_is_interned():
+    """Test that parsed event names are interned for identity-based dispatch"""
+    event, _ = parse_socketio_message('42["gameStateUpdate",{}]')
+    assert event is sys.intern("gameStateUpdate")
+
+def test_short_and_empty_frames_return_none():
+    """Test that empty and unknown short frames are not mistaken for events"""
+    for frame in ("", "4", "6", "40"):
+        assert parse_socketio_message(frame) == (None, None)
+
+def test_build_socketio_frame_round_trips():
+    """Test that outbound frames parse back to the same event and payload"""
+    frame = build_socketio_frame("placeBet", {"amount": 0.01, "autoSellMultiplier": None})
+    assert frame.startswith('42["placeBet",')
+    assert parse_socketio_message(frame) == ("placeBet", {"amount": 0.01, "autoSellMultiplier": None})
+
+@pytest.fixture
+def stdlib_json_utils(monkeypatch):
+    """Reload rugsbot.utils as if orjson were not installed"""
+    from rugsbot import utils
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(utils)
+    monkeypatch.undo()
+    importlib.reload(utils)
+
+def test_stdlib_fallback_rejects_trailing_data(stdlib_json_utils):
+    """Test that the json fallback rejects frames with data after the array, like orjson"""
+    assert stdlib_json_utils.orjson is None
+    assert stdlib_json_utils.parse_socketio_message('42["a",{}]junk') == (None, None)
+    assert stdlib_json_utils.parse_socketio_message('42["a",{}] \n') == ("a", {})